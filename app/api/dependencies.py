@@ -1,23 +1,14 @@
 # app/api/dependencies.py
-from fastapi import Depends
-from app.services.llm import LLMService
+from fastapi import Depends, Request
 from app.services.storage import StorageService
+from app.core.analyzer import ContractAnalyzer
 from app.config import get_settings
 from typing import AsyncGenerator
-from contextlib import asynccontextmanager
 
-@asynccontextmanager
-async def get_llm_service(
-    settings = Depends(get_settings)
-) -> AsyncGenerator[LLMService, None]:
-    service = LLMService(settings.GROQ_API_KEY)
-    try:
-        yield service
-    finally:
-        # No need for cleanup for LLM service
-        pass
+async def get_contract_analyzer(request: Request) -> ContractAnalyzer:
+    # Created once in the application lifespan (see app.main)
+    return request.app.state.analyzer
 
-@asynccontextmanager
 async def get_storage_service(
     settings = Depends(get_settings)
 ) -> AsyncGenerator[StorageService, None]:
@@ -1,17 +1,24 @@
 # app/api/routes/contracts.py
+import asyncio
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List
 from app.models.schemas import ContractAnalysisRequest, AnalysisReport
 from app.core.analyzer import ContractAnalyzer
-from app.api.dependencies import get_llm_service, get_storage_service
+from app.api.dependencies import get_contract_analyzer, get_storage_service
+from app.services.storage import StorageService
 from app.config import get_settings
 from app.utils import ValidationError, logger
 
 router = APIRouter(prefix="/contracts", tags=["contracts"])
 
+# Resolved once at import; only used for static upload validation
+_SETTINGS = get_settings()
+
 @router.post(
     "/analyze",
     response_model=AnalysisReport,
+    response_class=ORJSONResponse,
     summary="Analyze a single contract",
     description="Upload and analyze a contract file for compliance with specified regulations"
 )
@@ -19,24 +26,62 @@ async def analyze_contract(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     request: ContractAnalysisRequest = Depends(),
-    settings = Depends(get_settings)
+    storage_service: StorageService = Depends(get_storage_service),
+    analyzer: ContractAnalyzer = Depends(get_contract_analyzer)
 ):
     try:
         # Validate file type
-        if not file.filename or not file.filename.lower().endswith(tuple(settings.ALLOWED_EXTENSIONS)):
-            raise ValidationError(f"Invalid file type. Allowed types: {', '.join(settings.ALLOWED_EXTENSIONS)}")
+        if not file.filename or not file.filename.lower().endswith(_SETTINGS.allowed_ext_tuple):
+            raise ValidationError(f"Invalid file type. Allowed types: {', '.join(_SETTINGS.allowed_ext_tuple)}")
+        
+        # Save file temporarily
+        temp_path = await storage_service.save_temp_file(file)
+        background_tasks.add_task(storage_service.delete_temp_file, temp_path)
+
+        # Analyze contract
+        results = await analyzer.analyze_contract(temp_path, request.regulations)
         
-        async with get_storage_service(settings) as storage_service:
-            # Save file temporarily
+        return results
+
+    except ValidationError as e:
+        logger.error(f"Validation error: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post(
+    "/analyze-stream",
+    summary="Analyze a single contract with streamed progress",
+    description="Upload and analyze a contract file, streaming NDJSON events as each clause completes and the full report last"
+)
+async def analyze_contract_stream(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    request: ContractAnalysisRequest = Depends(),
+    analyzer: ContractAnalyzer = Depends(get_contract_analyzer)
+):
+    try:
+        # Validate file type
+        if not file.filename or not file.filename.lower().endswith(_SETTINGS.allowed_ext_tuple):
+            raise ValidationError(f"Invalid file type. Allowed types: {', '.join(_SETTINGS.allowed_ext_tuple)}")
+
+        # The storage dependency cleans up when the handler returns, before the
+        # stream is consumed, so this request's temp directory is removed once
+        # streaming finishes instead
+        storage_service = StorageService()
+        try:
             temp_path = await storage_service.save_temp_file(file)
-            background_tasks.add_task(storage_service.delete_temp_file, temp_path)
+        except Exception:
+            await storage_service.cleanup()
+            raise
+        background_tasks.add_task(storage_service.cleanup)
 
-            async with get_llm_service(settings) as llm_service:
-                # Analyze contract
-                analyzer = ContractAnalyzer(llm_service)
-                results = await analyzer.analyze_contract(temp_path, request.regulations)
-                
-                return results
+        return StreamingResponse(
+            analyzer.stream_analyze(temp_path, request.regulations),
+            media_type="application/x-ndjson",
+            background=background_tasks
+        )
 
     except ValidationError as e:
         logger.error(f"Validation error: {str(e)}")
@@ -48,6 +93,7 @@ async def analyze_contract(
 @router.post(
     "/analyze-batch",
     response_model=List[AnalysisReport],
+    response_class=ORJSONResponse,
     summary="Analyze multiple contracts",
     description="Upload and analyze multiple contract files in batch"
 )
@@ -55,27 +101,33 @@ async def analyze_multiple_contracts(
     background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     request: ContractAnalysisRequest = Depends(),
-    settings = Depends(get_settings)
+    storage_service: StorageService = Depends(get_storage_service),
+    analyzer: ContractAnalyzer = Depends(get_contract_analyzer)
 ):
     try:
-        temp_paths = []
-        async with get_storage_service(settings) as storage_service:
-            for file in files:
-                # Validate file type
-                if not file.filename or not file.filename.lower().endswith(tuple(settings.ALLOWED_EXTENSIONS)):
-                    raise ValidationError(f"Invalid file type: {file.filename}")
-                
-                # Save file temporarily
-                temp_path = await storage_service.save_temp_file(file)
-                temp_paths.append(temp_path)
-                background_tasks.add_task(storage_service.delete_temp_file, temp_path)
+        # Validate every file type before writing anything to disk
+        invalid = [
+            file.filename for file in files
+            if not file.filename or not file.filename.lower().endswith(_SETTINGS.allowed_ext_tuple)
+        ]
+        if invalid:
+            raise ValidationError(f"Invalid file types: {invalid}")
 
-            async with get_llm_service(settings) as llm_service:
-                # Analyze contracts
-                analyzer = ContractAnalyzer(llm_service)
-                results = await analyzer.analyze_multiple_contracts(temp_paths, request.regulations)
-                
-                return results
+        # Save files temporarily, writing them to disk concurrently
+        saved = await asyncio.gather(
+            *[storage_service.save_temp_file(file) for file in files],
+            return_exceptions=True
+        )
+        temp_paths = [path for path in saved if not isinstance(path, Exception)]
+        background_tasks.add_task(storage_service.delete_temp_files, temp_paths)
+        for result in saved:
+            if isinstance(result, Exception):
+                raise result
+
+        # Analyze contracts
+        results = await analyzer.analyze_multiple_contracts(temp_paths, request.regulations)
+        
+        return results
 
     except ValidationError as e:
         logger.error(f"Validation error: {str(e)}")
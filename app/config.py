@@ -1,6 +1,5 @@
-from pydantic_settings import BaseSettings
-from functools import lru_cache
-from typing import Set
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache, cached_property
 from pathlib import Path
 from enum import Enum
 
@@ -15,12 +14,26 @@ class Settings(BaseSettings):
     MODEL_NAME: str = "mixtral-8x7b-32768"
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
-    ALLOWED_EXTENSIONS: Set[str] = {".pdf", ".docx", ".doc", ".txt"}
+    ALLOWED_EXTENSIONS: frozenset[str] = frozenset({".pdf", ".docx", ".doc", ".txt"})
     ENVIRONMENT: EnvironmentType = EnvironmentType.DEVELOPMENT
+    LOG_LEVEL: str = "INFO"
+    LLM_CONCURRENCY: int = 10  # Max in-flight compliance LLM calls per process
+    FILE_CONCURRENCY: int = 4  # Max contracts analyzed at once in a batch
+    COMPLIANCE_BATCH_SIZE: int = 5  # Clauses analyzed per LLM call
+    COMPLIANCE_CACHE_SIZE: int = 10_000  # Cached (clause, regulation) results
+    EXTRACTION_CACHE_SIZE: int = 100  # Cached clause extractions (one per contract text)
+    LLM_CACHE_SIZE: int = 1_000  # Cached LLM responses for repeated prompts
     
-    class Config:
-        env_file = ".env"
-        use_enum_values = True
+    @cached_property
+    def allowed_ext_tuple(self) -> tuple[str, ...]:
+        """ALLOWED_EXTENSIONS as a sorted tuple, ready for str.endswith."""
+        return tuple(sorted(self.ALLOWED_EXTENSIONS))
+    
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        frozen=True,
+        use_enum_values=True
+    )
 
 @lru_cache()
 def get_settings():
@@ -1,18 +1,29 @@
 # app/core/analyzer.py
-from typing import List, Dict
+import asyncio
+import hashlib
+import orjson
+from typing import AsyncIterator, List, Dict, Tuple, Union
 from app.core.parser import ContractParser
-from app.core.compliance import ComplianceAnalyzer
+from app.core.compliance import ComplianceAnalyzer, normalize_clause_text
 from app.core.report import ReportGenerator
 from app.models.schemas import AnalysisReport, ClauseAnalysis, ComplianceResult
 from app.models.enums import RegulationType
 from app.services.llm import LLMService
+from app.config import get_settings
 from app.utils import AnalysisError, logger
 from datetime import datetime
 
+_PARSER = ContractParser()
+
+def _clause_key(text: str) -> str:
+    """Normalized digest used to spot duplicate clauses within a contract."""
+    return hashlib.blake2b(normalize_clause_text(text).encode(), digest_size=16).hexdigest()
+
 class ContractAnalyzer:
     def __init__(self, llm_service: LLMService):
         self.llm = llm_service
-        self.parser = ContractParser()
+        self.settings = get_settings()
+        self.parser = _PARSER
         self.compliance_analyzer = ComplianceAnalyzer(llm_service)
         self.report_generator = ReportGenerator(llm_service)
 
@@ -20,96 +31,243 @@ class ContractAnalyzer:
         self,
         file_path: str,
         regulations: List[RegulationType]
-    ) -> Dict:
+    ) -> AnalysisReport:
         try:
-            logger.info(f"Starting analysis for {file_path}")
-            
-            # Parse contract
-            contract_text = self.parser.parse(file_path)
-            
-            # Extract clauses
-            raw_clauses = await self.compliance_analyzer.extract_clauses(contract_text)
-            
-            # Convert to ClauseAnalysis objects
-            clauses = []
-            for clause in raw_clauses:
-                clause_model = ClauseAnalysis(
-                    id=clause["id"],
-                    text=clause["text"],
-                    primary_category=clause["primary_category"],
-                    secondary_categories=clause["secondary_categories"],
-                    obligations=clause["obligations"],
-                    deadlines=clause["deadlines"],
-                    compliance_risks=clause["compliance_risks"],
-                    risk_score=5.0
-                )
-                clauses.append(clause_model)
-            
-            # Analyze compliance for each clause
-            compliance_results = {}
-            for clause in clauses:
-                clause_results = {}
-                for regulation in regulations:
-                    try:
-                        # Convert Pydantic model to dict for analysis
-                        clause_data = {
-                            "text": clause.text,
-                            "primary_category": clause.primary_category,
-                            "secondary_categories": clause.secondary_categories,
-                            "obligations": clause.obligations,
-                            "deadlines": clause.deadlines,
-                            "compliance_risks": clause.compliance_risks
-                        }
-                        
-                        reg_result = await self.compliance_analyzer.analyze_compliance(
-                            clause_data,
-                            [regulation]
-                        )
-
-                        reg_data = reg_result.get(regulation.value, {})
-                        
-                        # Create ComplianceResult
-                        compliance_result = ComplianceResult(
-                            compliant=reg_data.get("compliant", False),
-                            requirements_met=reg_data.get("requirements_met", []),
-                            requirements_missing=reg_data.get("requirements_missing", []),
-                            risk_level=reg_data.get("risk_level", "high"),
-                            findings=reg_data.get("findings", []),
-                            recommendations=reg_data.get("recommendations", [])
-                        )
-                        clause_results[regulation.value] = compliance_result
-                    except Exception as e:
-                        logger.error(f"Failed to analyze {regulation.value}: {str(e)}")
-                        clause_results[regulation.value] = ComplianceResult()
-
-                compliance_results[clause.id] = clause_results
-
-            # Generate the summary using the report generator
-            summary = await self.report_generator.generate_report(
-                file_path=file_path,
-                clauses=[c.model_dump() for c in clauses],  # Convert clauses to dict
-                compliance_results={
-                    k: {
-                        reg: cr.model_dump() 
-                        for reg, cr in v.items()
-                    } 
-                    for k, v in compliance_results.items()
-                },  # Convert compliance results to dict
-                regulations=regulations
-            )
+            raw_clauses = await self._extract_clauses(file_path)
+            batches = self._build_batches(raw_clauses)
 
-            # Create the final report
-            report = AnalysisReport(
-                file_name=file_path,
-                analysis_timestamp=datetime.now(),
-                regulations=regulations,
-                clauses=clauses,
-                compliance_results=compliance_results,
-                summary=summary
+            # Analyze compliance in batches of clauses, running batches concurrently;
+            # one LLM call covers every clause and regulation in a batch, and the
+            # compliance analyzer caps how many calls are in flight
+            batch_results = await asyncio.gather(
+                *[self._analyze_batch(batch, regulations) for batch in batches]
             )
-            
-            return report.model_dump()
-            
+
+            results_by_key = {}
+            for batch, batch_result in batch_results:
+                results_by_key.update(self._map_batch_results(batch, batch_result))
+
+            return await self._build_report(file_path, raw_clauses, results_by_key, regulations)
+
+        except Exception as e:
+            logger.error(f"Analysis failed for {file_path}: {str(e)}")
+            raise AnalysisError(f"Contract analysis failed: {str(e)}")
+
+    async def stream_analyze(
+        self,
+        file_path: str,
+        regulations: List[RegulationType]
+    ) -> AsyncIterator[bytes]:
+        """Analyze a contract, yielding NDJSON progress events as clauses complete."""
+        tasks = []
+        try:
+            contract_text = await self._parse_contract(file_path)
+
+            # Start compliance batches while extraction is still streaming;
+            # members maps each distinct clause text to the ids sharing it
+            raw_clauses = []
+            members = {}
+            batch = []
+            batch_size = self.settings.COMPLIANCE_BATCH_SIZE
+            async for clause in self.compliance_analyzer.extract_clauses_stream(contract_text):
+                raw_clauses.append(clause)
+                key = _clause_key(clause["text"])
+                if key not in members:
+                    members[key] = []
+                    batch.append(clause)
+                    if len(batch) == batch_size:
+                        tasks.append(asyncio.ensure_future(self._analyze_batch(batch, regulations)))
+                        batch = []
+                members[key].append(clause["id"])
+            if batch:
+                tasks.append(asyncio.ensure_future(self._analyze_batch(batch, regulations)))
+
+            yield self._event({"type": "clauses_extracted", "total_clauses": len(raw_clauses)})
+
+            # Emit results in completion order
+            results_by_key = {}
+            for next_done in asyncio.as_completed(tasks):
+                batch, batch_result = await next_done
+                batch_results = self._map_batch_results(batch, batch_result)
+                results_by_key.update(batch_results)
+                for key, reg_result in batch_results.items():
+                    compliance_results = self._compliance_dicts(reg_result, regulations)
+                    for clause_id in members[key]:
+                        yield self._event({
+                            "type": "clause_done",
+                            "clause_id": clause_id,
+                            "compliance_results": compliance_results
+                        })
+
+            report = await self._build_report(file_path, raw_clauses, results_by_key, regulations)
+            yield self._event({"type": "report", "report": report.model_dump(mode="json")})
+
         except Exception as e:
             logger.error(f"Analysis failed for {file_path}: {str(e)}")
-            raise AnalysisError(f"Contract analysis failed: {str(e)}")
\ No newline at end of file
+            yield self._event({"type": "error", "detail": f"Contract analysis failed: {str(e)}"})
+        finally:
+            # Stop outstanding LLM calls if the client goes away mid-stream
+            for task in tasks:
+                task.cancel()
+
+    async def analyze_multiple_contracts(
+        self,
+        file_paths: List[str],
+        regulations: List[RegulationType]
+    ) -> List[AnalysisReport]:
+        """Analyze several contracts concurrently; failures yield an error report."""
+        sem = asyncio.Semaphore(self.settings.FILE_CONCURRENCY)
+
+        async def _guarded(file_path: str) -> AnalysisReport:
+            async with sem:
+                try:
+                    return await self.analyze_contract(file_path, regulations)
+                except Exception as e:
+                    logger.error(f"Batch analysis failed for {file_path}: {str(e)}")
+                    return AnalysisReport(
+                        file_name=file_path,
+                        analysis_timestamp=datetime.now(),
+                        regulations=regulations,
+                        clauses=[],
+                        compliance_results={},
+                        summary={"error": str(e)}
+                    )
+
+        return await asyncio.gather(*[_guarded(path) for path in file_paths])
+
+    async def _extract_clauses(self, file_path: str) -> List[Dict]:
+        """Parse the contract file and extract its clauses."""
+        contract_text = await self._parse_contract(file_path)
+
+        # Extract clauses
+        return await self.compliance_analyzer.extract_clauses(contract_text)
+
+    async def _parse_contract(self, file_path: str) -> str:
+        """Parse the contract file to text."""
+        logger.info(f"Starting analysis for {file_path}")
+
+        # Parse contract off the event loop; PDF/DOCX parsing is blocking
+        return await asyncio.to_thread(self.parser.parse, file_path)
+
+    def _build_batches(self, raw_clauses: List[Dict]) -> List[List[Dict]]:
+        """Group distinct clauses into batches of COMPLIANCE_BATCH_SIZE."""
+        # Analyze each distinct clause text once; duplicates share its results
+        unique_clauses = {}
+        for clause in raw_clauses:
+            unique_clauses.setdefault(_clause_key(clause["text"]), clause)
+        unique = list(unique_clauses.values())
+
+        batch_size = self.settings.COMPLIANCE_BATCH_SIZE
+        return [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+
+    async def _analyze_batch(
+        self,
+        batch: List[Dict],
+        regulations: List[RegulationType]
+    ) -> Tuple[List[Dict], Union[List[Dict], Exception]]:
+        """Analyze one batch of clauses, returning any failure instead of raising."""
+        try:
+            return batch, await self.compliance_analyzer.analyze_compliance_batch(
+                batch,
+                regulations
+            )
+        except Exception as e:
+            return batch, e
+
+    def _map_batch_results(
+        self,
+        batch: List[Dict],
+        batch_result: Union[List[Dict], Exception]
+    ) -> Dict[str, Union[Dict, Exception]]:
+        """Key a batch's per-clause results by normalized clause text."""
+        if isinstance(batch_result, Exception):
+            return {_clause_key(clause["text"]): batch_result for clause in batch}
+        return {
+            _clause_key(clause["text"]): result
+            for clause, result in zip(batch, batch_result)
+        }
+
+    def _compliance_dicts(
+        self,
+        reg_result: Union[Dict, Exception],
+        regulations: List[RegulationType]
+    ) -> Dict[str, Dict]:
+        """Build validated per-regulation compliance dicts for one clause.
+
+        Each regulation's result is validated on its own; a malformed one
+        degrades to the default ComplianceResult without affecting the rest.
+        """
+        clause_results = {}
+        for regulation in regulations:
+            if isinstance(reg_result, Exception):
+                logger.error(f"Failed to analyze {regulation.value}: {str(reg_result)}")
+                compliance_result = ComplianceResult()
+            else:
+                try:
+                    reg_data = reg_result.get(regulation.value, {})
+                    compliance_result = ComplianceResult(
+                        compliant=reg_data.get("compliant", False),
+                        requirements_met=reg_data.get("requirements_met", []),
+                        requirements_missing=reg_data.get("requirements_missing", []),
+                        risk_level=reg_data.get("risk_level", "high"),
+                        findings=reg_data.get("findings", []),
+                        recommendations=reg_data.get("recommendations", [])
+                    )
+                except Exception as e:
+                    logger.error(f"Invalid {regulation.value} result: {str(e)}")
+                    compliance_result = ComplianceResult()
+
+            clause_results[regulation.value] = compliance_result.model_dump()
+        return clause_results
+
+    async def _build_report(
+        self,
+        file_path: str,
+        raw_clauses: List[Dict],
+        results_by_key: Dict[str, Union[Dict, Exception]],
+        regulations: List[RegulationType]
+    ) -> AnalysisReport:
+        """Assemble the final AnalysisReport from per-clause results."""
+        clause_dicts = [{**clause, "risk_score": 5.0} for clause in raw_clauses]
+
+        # Keep compliance results as plain dicts for the summary; models are
+        # built from them once, at the end
+        compliance_results = {
+            clause["id"]: self._compliance_dicts(
+                results_by_key[_clause_key(clause["text"])],
+                regulations
+            )
+            for clause in raw_clauses
+        }
+
+        # Generate the summary using the report generator
+        summary = await self.report_generator.generate_report(
+            file_path=file_path,
+            clauses=clause_dicts,
+            compliance_results=compliance_results,
+            regulations=regulations
+        )
+
+        # Create the final report without re-validating it; FastAPI passes
+        # model instances through as-is on every endpoint. Clauses are shaped
+        # by _process_clause and each compliance result was validated in
+        # _compliance_dicts, so the fields already match the schema.
+        return AnalysisReport.model_construct(
+            file_name=file_path,
+            analysis_timestamp=datetime.now(),
+            regulations=regulations,
+            clauses=[ClauseAnalysis.model_construct(**clause) for clause in clause_dicts],
+            compliance_results={
+                clause_id: {
+                    reg_value: ComplianceResult.model_construct(**reg_result)
+                    for reg_value, reg_result in clause_results.items()
+                }
+                for clause_id, clause_results in compliance_results.items()
+            },
+            summary=summary
+        )
+
+    @staticmethod
+    def _event(event: Dict) -> bytes:
+        """Encode a progress event as one NDJSON line."""
+        return orjson.dumps(event) + b"\n"
\ No newline at end of file
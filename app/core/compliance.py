@@ -1,23 +1,161 @@
 # app/core/compliance.py
-from typing import Dict, List, Optional, Any
-from app.models.enums import RegulationType, ClauseCategory
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Any, Tuple, TypeVar
+from app.models.enums import RegulationType, CATEGORY_VALUES, RISK_LEVEL_VALUES
 from app.models.schemas import ComplianceResult
 from app.services.llm import LLMService
+from app.config import get_settings
 from app.utils import ComplianceError, logger
+import asyncio
 import uuid
-import json
+import orjson
 import re
-from functools import lru_cache
+import hashlib
+from collections import OrderedDict
+
+# Process-wide LRU of compliance results keyed by (clause text digest, regulation),
+# shared across requests so boilerplate clauses are only analyzed once
+_COMPLIANCE_CACHE: "OrderedDict[Tuple[bytes, str], Dict[str, Any]]" = OrderedDict()
+
+T = TypeVar("T")
+
+_QUOTE_TABLE = str.maketrans({"\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"'})
+
+# Patterns used to pull JSON out of LLM responses, compiled once
+_JSON_OBJ_RE = re.compile(r'\{.*\}', re.DOTALL)
+_JSON_ARR_RE = re.compile(r'\[.*\]', re.DOTALL)
+_JSON_SMALL_OBJ_RE = re.compile(r'\{[^{}]*\}')
+_MD_FENCE_RE = re.compile(r'```(?:json)?\s*')
+_KEY_STR_RE = re.compile(r'"\s*:\s*"')
+_KEY_ARR_RE = re.compile(r'"\s*:\s*\[')
+_ARR_NEXT_KEY_RE = re.compile(r'\]\s*,\s*"')
+
+def _iter_json_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """Locate each top-level balanced JSON object or array in text, in order.
+
+    Scans once, tracking bracket depth and skipping brackets inside string
+    literals. Yields ``(start, end)`` slice bounds; callers pick the first
+    span of the shape they expect, so stray brackets earlier in a response
+    don't hide the real payload.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escape = False
+    for index, char in enumerate(text):
+        if depth == 0:
+            if char in "{[":
+                start = index
+                depth = 1
+            continue
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                yield start, index + 1
+
+class _ArrayObjectScanner:
+    """Incrementally pull complete JSON objects out of arrays in streamed text.
+
+    Fed response chunks as they arrive; each call returns the raw text of any
+    object that is a direct element of an array and closed within the chunk,
+    such as the entries of ``{"clauses": [...]}``.
+    """
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._capture: Optional[List[str]] = None
+        self._capture_depth = 0
+
+    def feed(self, chunk: str) -> List[str]:
+        objects = []
+        for char in chunk:
+            if self._capture is not None:
+                self._capture.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and self._capture is None and self._stack[-1:] == ["["]:
+                    self._capture = [char]
+                    self._capture_depth = len(self._stack)
+                self._stack.append(char)
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                if self._capture is not None and len(self._stack) == self._capture_depth:
+                    objects.append("".join(self._capture))
+                    self._capture = None
+        return objects
+
+class _NonPrintableTable(dict):
+    """str.translate table deleting non-printable characters except ``keep``.
+
+    Entries are filled lazily per code point, so lookups after the first
+    occurrence of a character are plain dict hits.
+    """
+
+    def __init__(self, keep: str):
+        super().__init__()
+        self.keep = keep
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        value = codepoint if char.isprintable() or char in self.keep else None
+        self[codepoint] = value
+        return value
+
+# Drops control characters from raw LLM responses. Typographic quotes are left
+# alone: inside JSON string values they are content, and folding them to '"'
+# would break parsing
+_CLEAN_TABLE = _NonPrintableTable("\n\r\t")
+
+def normalize_clause_text(text: str) -> str:
+    """Canonical form of clause or contract text for cache and dedupe keys.
+
+    Case, whitespace runs and typographic quotes are folded so that
+    reformatted copies of the same template text share one cache entry.
+    """
+    return " ".join(text.translate(_QUOTE_TABLE).casefold().split())
+
+def _content_hash(text: str) -> bytes:
+    """Stable digest of normalized text for use as a cache key."""
+    return hashlib.blake2b(normalize_clause_text(text).encode(), digest_size=16).digest()
 
 class ComplianceAnalyzer:
     def __init__(self, llm_service: LLMService):
         self.llm = llm_service
+        self.settings = get_settings()
+        # Bounds every LLM call made through this analyzer, including fallbacks
+        self._llm_semaphore = asyncio.Semaphore(self.settings.LLM_CONCURRENCY)
         self.setup_prompts()
-        self._clause_cache = {}
+        self._clause_cache = OrderedDict()
 
     def setup_prompts(self):
-        """Set up the prompts for the analysis."""
-        self.extraction_prompt = """Analyze the contract below and extract its clauses.
+        """Set up the prompts for the analysis.
+
+        Each prompt is split into a static system part, sent byte-identical on
+        every call so the provider can cache the prefix, and a user part holding
+        the per-call content. Compliance user prompts are assembled around
+        _render_clause rather than formatted from a template.
+        """
+        self.extraction_system = """Analyze the contract provided by the user and extract its clauses.
 
 Output Format:
 {
@@ -33,35 +171,21 @@ Output Format:
     ]
 }
 
-Categories: data_privacy, security, liability, termination, payment, confidentiality, intellectual_property, compliance, force_majeure, dispute_resolution
-
-Contract:
-{text}"""
+Categories: data_privacy, security, liability, termination, payment, confidentiality, intellectual_property, compliance, force_majeure, dispute_resolution"""
 
-        self.compliance_prompt = """You are a compliance expert. Analyze the following clause for {regulation} compliance.
+        self.extraction_user = "Contract:\n"
 
-Clause Details:
-Primary Category: {primary_category}
-Secondary Categories: {secondary_categories}
-Obligations:
-{obligations}
-Deadlines:
-{deadlines}
-Identified Compliance Risks:
-{compliance_risks}
-
-Complete Clause Text:
-{text}
+        self.compliance_system = """You are a compliance expert. Analyze the clause provided by the user for compliance with the named regulation.
 
 Analyze considering:
 1. The appropriateness of the categorization
 2. The completeness of obligations
 3. The accuracy of identified risks
-4. Specific {regulation} requirements
+4. Specific requirements of the regulation
 5. Deadlines and timing requirements
 
 Provide your analysis in this exact JSON format:
-{{
+{
     "compliant": false,
     "requirements_met": [
         "List specific requirements that are met"
@@ -76,79 +200,319 @@ Provide your analysis in this exact JSON format:
     "recommendations": [
         "List specific, actionable recommendations"
     ]
-}}
+}
+
+Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level."""
+
+        self.multi_compliance_system = """You are a compliance expert. Analyze the clause provided by the user for compliance with each of the listed regulations.
+
+Analyze considering:
+1. The appropriateness of the categorization
+2. The completeness of obligations
+3. The accuracy of identified risks
+4. The specific requirements of each listed regulation
+5. Deadlines and timing requirements
+
+Provide your analysis in this exact JSON format, with one entry per regulation keyed by its identifier:
+{
+    "<regulation>": {
+        "compliant": false,
+        "requirements_met": [
+            "List specific requirements that are met"
+        ],
+        "requirements_missing": [
+            "List specific missing requirements"
+        ],
+        "risk_level": "high/medium/low",
+        "findings": [
+            "List detailed findings considering all provided context"
+        ],
+        "recommendations": [
+            "List specific, actionable recommendations"
+        ]
+    }
+}
+
+Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level."""
+
+        self.batch_compliance_system = """You are a compliance expert. Analyze each of the numbered clauses provided by the user for compliance with each of the listed regulations.
+
+Analyze considering:
+1. The appropriateness of the categorization
+2. The completeness of obligations
+3. The accuracy of identified risks
+4. The specific requirements of each listed regulation
+5. Deadlines and timing requirements
+
+Provide your analysis in this exact JSON format, with one entry per clause keyed by its number, each holding one entry per regulation keyed by its identifier:
+{
+    "<clause number>": {
+        "<regulation>": {
+            "compliant": false,
+            "requirements_met": [
+                "List specific requirements that are met"
+            ],
+            "requirements_missing": [
+                "List specific missing requirements"
+            ],
+            "risk_level": "high/medium/low",
+            "findings": [
+                "List detailed findings considering all provided context"
+            ],
+            "recommendations": [
+                "List specific, actionable recommendations"
+            ]
+        }
+    }
+}
 
 Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level."""
 
 
-    @lru_cache(maxsize=100)
     def _get_clause_hash(self, text: str) -> str:
-        """Generate hash for clause text."""
-        return str(hash(text))
+        """Generate a stable hash of the normalized clause text."""
+        return _content_hash(text).hex()
 
     async def extract_clauses(self, contract_text: str) -> List[Dict]:
         """Extract clauses from contract text."""
         try:
-            # Check cache
+            # Check cache; keyed on normalized text so reformatted copies hit
             cache_key = self._get_clause_hash(contract_text)
             if cache_key in self._clause_cache:
                 logger.info("Using cached clause extraction")
+                self._clause_cache.move_to_end(cache_key)
                 return self._clause_cache[cache_key]
 
             logger.info("Generating clause extraction response")
-            response = await self.llm.generate(
-                self.extraction_prompt + contract_text
+            clauses = await self._generate(
+                self.extraction_system,
+                self.extraction_user + contract_text,
+                self._parse_extraction_response
             )
-            
-            if not response:
-                raise ComplianceError("Empty response from LLM")
+            self._cache_clauses(cache_key, clauses)
+            return clauses
+
+        except Exception as e:
+            logger.error(f"Clause extraction failed: {str(e)}")
+            raise ComplianceError(str(e))
 
-            cleaned_json = self._clean_json_response(response)
-            if not cleaned_json:
-                raise ComplianceError("Failed to extract valid JSON from response")
+    async def extract_clauses_stream(self, contract_text: str) -> AsyncIterator[Dict]:
+        """Extract clauses from contract text, yielding each as soon as it is generated.
 
-            data = self._parse_json_with_fallbacks(cleaned_json)
-            if not data:
-                raise ComplianceError("Failed to parse response as JSON")
+        Clause objects are parsed out of the streamed LLM response as they
+        close, so callers can start analyzing early clauses while extraction
+        is still running.
+        """
+        try:
+            cache_key = self._get_clause_hash(contract_text)
+            if cache_key in self._clause_cache:
+                logger.info("Using cached clause extraction")
+                self._clause_cache.move_to_end(cache_key)
+                for clause in self._clause_cache[cache_key]:
+                    yield clause
+                return
+
+            logger.info("Streaming clause extraction response")
+            scanner = _ArrayObjectScanner()
+            chunks = []
+            clauses = []
+            async with self._llm_semaphore:
+                async for chunk in self.llm.generate_stream(
+                    system=self.extraction_system,
+                    user=self.extraction_user + contract_text
+                ):
+                    chunks.append(chunk)
+                    for raw in scanner.feed(chunk):
+                        try:
+                            clause = self._process_clause(orjson.loads(raw))
+                        except orjson.JSONDecodeError:
+                            continue
+                        if clause:
+                            clauses.append(clause)
+                            yield clause
 
-            clauses = self._extract_clauses_from_data(data)
             if not clauses:
-                raise ComplianceError("No valid clauses found in response")
+                # Nothing parsed incrementally; fall back to the full-response parser
+                clauses = self._parse_extraction_response("".join(chunks))
+                for clause in clauses:
+                    yield clause
 
-            # Cache results
-            self._clause_cache[cache_key] = clauses
-            logger.info(f"Successfully extracted {len(clauses)} clauses")
-            return clauses
+            self._cache_clauses(cache_key, clauses)
 
         except Exception as e:
             logger.error(f"Clause extraction failed: {str(e)}")
             raise ComplianceError(str(e))
+
+    def _parse_extraction_response(self, response: str) -> List[Dict]:
+        """Parse and validate the clauses in a complete extraction response."""
+        if not response:
+            raise ComplianceError("Empty response from LLM")
+
+        cleaned_json = self._clean_json_response(response)
+        if not cleaned_json:
+            raise ComplianceError("Failed to extract valid JSON from response")
+
+        data = self._parse_json_with_fallbacks(cleaned_json)
+        if not data:
+            raise ComplianceError("Failed to parse response as JSON")
+
+        clauses = self._extract_clauses_from_data(data)
+        if not clauses:
+            raise ComplianceError("No valid clauses found in response")
+        return clauses
+
+    def _cache_clauses(self, cache_key: str, clauses: List[Dict]) -> None:
+        """Store an extraction result in the bounded LRU."""
+        self._clause_cache[cache_key] = clauses
+        while len(self._clause_cache) > self.settings.EXTRACTION_CACHE_SIZE:
+            self._clause_cache.popitem(last=False)
+        logger.info(f"Successfully extracted {len(clauses)} clauses")
         
     async def analyze_compliance(
         self,
         clause: Dict[str, Any],
         regulations: List[RegulationType]
     ) -> Dict[str, Any]:
-        """Analyze clause compliance against multiple regulations."""
+        """Analyze clause compliance against multiple regulations in one LLM call."""
         try:
-            results = {}
-            for regulation in regulations:
+            results = self._get_cached_results(clause, regulations)
+            pending = [reg for reg in regulations if reg.value not in results]
+            if len(pending) > 1:
                 try:
-                    logger.debug(f"Analyzing {regulation.value} compliance")
-                    results[regulation.value] = await self._analyze_single_regulation(
-                        clause,
-                        regulation
-                    )
+                    results.update(await self._analyze_regulations(clause, pending))
                 except Exception as e:
-                    logger.error(f"Failed to analyze {regulation.value}: {str(e)}")
-                    results[regulation.value] = self._get_default_result()
+                    logger.error(f"Combined compliance analysis failed: {str(e)}")
+
+            # Fall back to one call per regulation, run concurrently, for anything
+            # the combined call missed
+            remaining = [reg for reg in pending if reg.value not in results]
+            single_results = await asyncio.gather(
+                *[self._analyze_single_regulation(clause, reg) for reg in remaining],
+                return_exceptions=True
+            )
+            for regulation, result in zip(remaining, single_results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to analyze {regulation.value}: {str(result)}")
+                    result = self._get_default_result()
+                results[regulation.value] = result
 
+            self._cache_results(clause, results)
             return results
 
         except Exception as e:
             logger.error(f"Compliance analysis failed: {str(e)}")
             return {reg.value: self._get_default_result() for reg in regulations}
 
+    async def analyze_compliance_batch(
+        self,
+        clauses: List[Dict[str, Any]],
+        regulations: List[RegulationType]
+    ) -> List[Dict[str, Any]]:
+        """Analyze several clauses in one LLM call; results follow clause order."""
+        results = [self._get_cached_results(clause, regulations) for clause in clauses]
+        pending = [index for index, cached in enumerate(results) if len(cached) < len(regulations)]
+        if not pending:
+            return results
+
+        if len(pending) == 1:
+            index = pending[0]
+            missing = [reg for reg in regulations if reg.value not in results[index]]
+            results[index].update(await self.analyze_compliance(clauses[index], missing))
+            return results
+
+        pending_regulations = [
+            reg for reg in regulations
+            if any(reg.value not in results[index] for index in pending)
+        ]
+        try:
+            batch_results = await self._analyze_clause_batch(
+                [clauses[index] for index in pending],
+                pending_regulations
+            )
+        except Exception as e:
+            logger.error(f"Batch compliance analysis failed: {str(e)}")
+            batch_results = {}
+
+        missing_by_index = {}
+        for position, index in enumerate(pending):
+            clause_results = results[index]
+            for reg_value, reg_result in batch_results.get(position, {}).items():
+                clause_results.setdefault(reg_value, reg_result)
+            missing = [reg for reg in regulations if reg.value not in clause_results]
+            if missing:
+                missing_by_index[index] = missing
+
+        # Re-analyze anything the batched response left out, concurrently
+        fallback_results = await asyncio.gather(
+            *[self.analyze_compliance(clauses[index], missing) for index, missing in missing_by_index.items()]
+        )
+        for index, fallback in zip(missing_by_index, fallback_results):
+            results[index].update(fallback)
+
+        for index in pending:
+            self._cache_results(clauses[index], results[index])
+
+        return results
+
+    async def _analyze_clause_batch(
+        self,
+        clauses: List[Dict[str, Any]],
+        regulations: List[RegulationType]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Analyze a batch of clauses with a single prompt, keyed by clause index."""
+        regulation_names = ", ".join(reg.value for reg in regulations)
+        formatted_prompt = (
+            "Analyze each of the numbered clauses below for compliance with each "
+            f"of these regulations: {regulation_names}.\n\n"
+            + "\n\n".join(
+                f"Clause {number}:\n{self._render_clause(clause)}"
+                for number, clause in enumerate(clauses, start=1)
+            )
+        )
+
+        data = await self._generate(
+            self.batch_compliance_system,
+            formatted_prompt,
+            self._parse_json_object
+        )
+
+        results = {}
+        for number in range(1, len(clauses) + 1):
+            clause_data = data.get(str(number))
+            if not isinstance(clause_data, dict):
+                continue
+            results[number - 1] = {
+                reg.value: self._normalize_result(clause_data[reg.value])
+                for reg in regulations
+                if isinstance(clause_data.get(reg.value), dict)
+            }
+
+        return results
+
+    async def _analyze_regulations(
+        self,
+        clause: Dict[str, Any],
+        regulations: List[RegulationType]
+    ) -> Dict[str, Any]:
+        """Analyze compliance against several regulations with a single prompt."""
+        regulation_names = ", ".join(reg.value for reg in regulations)
+        formatted_prompt = (
+            "Analyze the following clause for compliance with each of these "
+            f"regulations: {regulation_names}.\n\n{self._render_clause(clause)}"
+        )
+
+        data = await self._generate(
+            self.multi_compliance_system,
+            formatted_prompt,
+            self._parse_json_object
+        )
+
+        return {
+            reg.value: self._normalize_result(data[reg.value])
+            for reg in regulations
+            if isinstance(data.get(reg.value), dict)
+        }
+
     async def _analyze_single_regulation(
         self,
         clause: Dict[str, Any],
@@ -157,71 +521,108 @@ Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level.
         """Analyze compliance against a single regulation."""
         try:
             # Format the prompt with all clause information
-            formatted_prompt = self.compliance_prompt.format(
-                regulation=regulation.value,
-                text=clause.get("text", ""),
-                primary_category=clause.get("primary_category", ""),
-                secondary_categories=", ".join(clause.get("secondary_categories", [])),
-                obligations="\n".join(f"- {o}" for o in clause.get("obligations", [])),
-                deadlines="\n".join(f"- {d}" for d in clause.get("deadlines", [])),
-                compliance_risks="\n".join(f"- {r}" for r in clause.get("compliance_risks", []))
+            formatted_prompt = (
+                f"Analyze the following clause for {regulation.value} compliance.\n\n"
+                f"{self._render_clause(clause)}"
             )
             
-            response = await self.llm.generate(formatted_prompt)
-            cleaned_response = self._extract_json_from_response(response)
-            
-            if not cleaned_response:
-                raise ValueError("No valid JSON found in response")
-
-            result = json.loads(cleaned_response)
-            
-            return {
-                "compliant": bool(result.get("compliant", False)),
-                "requirements_met": result.get("requirements_met", []),
-                "requirements_missing": result.get("requirements_missing", []),
-                "risk_level": self._validate_risk_level(result.get("risk_level", "high")),
-                "findings": result.get("findings", []),
-                "recommendations": result.get("recommendations", [])
-            }
+            data = await self._generate(
+                self.compliance_system,
+                formatted_prompt,
+                self._parse_json_object
+            )
+            return self._normalize_result(data)
 
         except Exception as e:
             logger.error(f"Regulation analysis failed for {regulation.value}: {str(e)}")
             return self._get_default_result()
 
-    # async def analyze_compliance(
-    #     self,
-    #     clause: Dict[str, str],
-    #     regulations: List[RegulationType]
-    # ) -> Dict[str, Any]:
-    #     """Analyze clause compliance against multiple regulations."""
-    #     try:
-    #         # Cache key for compliance results
-    #         cache_key = f"{self._get_clause_hash(clause['text'])}_{','.join(sorted([r.value for r in regulations]))}"
-            
-    #         # Check cache
-    #         if cache_key in self._clause_cache:
-    #             return self._clause_cache[cache_key]
-
-    #         results = {}
-    #         for regulation in regulations:
-    #             try:
-    #                 logger.debug(f"Analyzing {regulation.value} compliance")
-    #                 results[regulation.value] = await self._analyze_single_regulation(
-    #                     clause["text"],
-    #                     regulation
-    #                 )
-    #             except Exception as e:
-    #                 logger.error(f"Failed to analyze {regulation.value}: {str(e)}")
-    #                 results[regulation.value] = self._get_default_result()
-
-    #         # Cache results
-    #         self._clause_cache[cache_key] = results
-    #         return results
-
-    #     except Exception as e:
-    #         logger.error(f"Compliance analysis failed: {str(e)}")
-    #         return {reg.value: self._get_default_result() for reg in regulations}
+    async def _generate(self, system: str, user: str, parse: Callable[[str], T]) -> T:
+        """Call the LLM, holding a slot of the LLM_CONCURRENCY semaphore, and parse the reply.
+
+        A reply that parse rejects is evicted from the LLM response cache so a
+        retry asks the model again instead of replaying it.
+        """
+        async with self._llm_semaphore:
+            response = await self.llm.generate(system=system, user=user)
+        try:
+            return parse(response)
+        except Exception:
+            self.llm.evict(user, system)
+            raise
+
+    def _parse_json_object(self, response: str) -> Dict[str, Any]:
+        """Parse the JSON object in a compliance response."""
+        cleaned_response = self._extract_json_from_response(response)
+        if not cleaned_response:
+            raise ValueError("No valid JSON found in response")
+
+        data = orjson.loads(cleaned_response)
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object")
+        return data
+
+    def _get_cached_results(
+        self,
+        clause: Dict[str, Any],
+        regulations: List[RegulationType]
+    ) -> Dict[str, Any]:
+        """Return cached results for this clause text, keyed by regulation."""
+        digest = _content_hash(clause.get("text", ""))
+        results = {}
+        for regulation in regulations:
+            key = (digest, regulation.value)
+            cached = _COMPLIANCE_CACHE.get(key)
+            if cached is not None:
+                _COMPLIANCE_CACHE.move_to_end(key)
+                results[regulation.value] = dict(cached)
+        return results
+
+    def _cache_results(self, clause: Dict[str, Any], results: Dict[str, Any]) -> None:
+        """Store successful per-regulation results for this clause text."""
+        digest = _content_hash(clause.get("text", ""))
+        default_result = self._get_default_result()
+        for reg_value, result in results.items():
+            if result == default_result:
+                continue
+            key = (digest, reg_value)
+            _COMPLIANCE_CACHE[key] = dict(result)
+            _COMPLIANCE_CACHE.move_to_end(key)
+        while len(_COMPLIANCE_CACHE) > self.settings.COMPLIANCE_CACHE_SIZE:
+            _COMPLIANCE_CACHE.popitem(last=False)
+
+    def _render_clause(self, clause: Dict[str, Any]) -> str:
+        """Render the clause details block shared by the compliance prompts."""
+        secondary_categories = ", ".join(clause.get("secondary_categories", []))
+        obligations = "\n".join(f"- {o}" for o in clause.get("obligations", []))
+        deadlines = "\n".join(f"- {d}" for d in clause.get("deadlines", []))
+        compliance_risks = "\n".join(f"- {r}" for r in clause.get("compliance_risks", []))
+        return (
+            "Clause Details:\n"
+            f"Primary Category: {clause.get('primary_category', '')}\n"
+            f"Secondary Categories: {secondary_categories}\n"
+            f"Obligations:\n{obligations}\n"
+            f"Deadlines:\n{deadlines}\n"
+            f"Identified Compliance Risks:\n{compliance_risks}\n\n"
+            f"Complete Clause Text:\n{clause.get('text', '')}"
+        )
+
+    def _normalize_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Coerce a parsed LLM compliance result into the expected shape."""
+        return {
+            "compliant": bool(result.get("compliant", False)),
+            "requirements_met": self._str_list(result.get("requirements_met")),
+            "requirements_missing": self._str_list(result.get("requirements_missing")),
+            "risk_level": self._validate_risk_level(result.get("risk_level", "high")),
+            "findings": self._str_list(result.get("findings")),
+            "recommendations": self._str_list(result.get("recommendations"))
+        }
 
+    def _str_list(self, value: Any) -> List[str]:
+        """Coerce an LLM list field to strings: a bare string is wrapped, other items dropped."""
+        if isinstance(value, str):
+            value = [value]
+        return self._process_list(value, self._clean_text)
 
     def _clean_json_response(self, response: str) -> Optional[str]:
         """Clean and extract JSON from response."""
@@ -229,16 +630,26 @@ Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level.
             return None
 
         try:
-            # Remove any non-printable characters
-            response = ''.join(char for char in response if char.isprintable() or char in ['\n', '\r', '\t'])
+            response = self._normalize_response(response)
             
-            # Try to find JSON structure
-            json_match = re.search(r'\{[\s\S]*\}', response)
+            # Scan for a balanced clauses object, or failing that an array of objects
+            clause_array = None
+            for start, end in _iter_json_spans(response):
+                candidate = response[start:end]
+                if candidate.startswith('{') and '"clauses"' in candidate:
+                    return candidate
+                if clause_array is None and candidate.startswith('[') and '{' in candidate:
+                    clause_array = candidate
+            if clause_array is not None:
+                return f'{{"clauses": {clause_array}}}'
+
+            # Fall back to regex matching
+            json_match = _JSON_OBJ_RE.search(response)
             if json_match and '"clauses"' in json_match.group(0):
                 return json_match.group(0)
 
             # Try finding array structure
-            array_match = re.search(r'\[([\s\S]*)\]', response)
+            array_match = _JSON_ARR_RE.search(response)
             if array_match:
                 return f'{{"clauses": {array_match.group(0)}}}'
 
@@ -253,28 +664,28 @@ Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level.
         try:
             # First attempt: direct parsing
             try:
-                return json.loads(json_str)
-            except json.JSONDecodeError:
+                return orjson.loads(json_str)
+            except orjson.JSONDecodeError:
                 logger.debug("Direct JSON parsing failed, trying cleanup")
 
             # Second attempt: clean and retry
             cleaned = json_str.replace('\n', ' ').replace('\r', '')
-            cleaned = re.sub(r'"\s*:\s*"', '": "', cleaned)
-            cleaned = re.sub(r'"\s*:\s*\[', '": [', cleaned)
-            cleaned = re.sub(r'\]\s*,\s*"', '], "', cleaned)
+            cleaned = _KEY_STR_RE.sub('": "', cleaned)
+            cleaned = _KEY_ARR_RE.sub('": [', cleaned)
+            cleaned = _ARR_NEXT_KEY_RE.sub('], "', cleaned)
             
             try:
-                return json.loads(cleaned)
-            except json.JSONDecodeError:
+                return orjson.loads(cleaned)
+            except orjson.JSONDecodeError:
                 logger.debug("Cleaned JSON parsing failed, trying reconstruction")
 
             # Third attempt: reconstruct
-            clauses_content = re.findall(r'\{[^{}]*\}', cleaned)
+            clauses_content = _JSON_SMALL_OBJ_RE.findall(cleaned)
             if clauses_content:
                 reconstructed = {"clauses": []}
                 for clause in clauses_content:
                     try:
-                        clause_obj = json.loads(clause)
+                        clause_obj = orjson.loads(clause)
                         reconstructed["clauses"].append(clause_obj)
                     except:
                         continue
@@ -316,7 +727,7 @@ Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level.
                 return None
 
             return {
-                "id": str(uuid.uuid4()),
+                "id": uuid.uuid4().hex,
                 "text": text,
                 "primary_category": self._validate_category(clause.get("primary_category", "other")),
                 "secondary_categories": self._process_list(
@@ -340,65 +751,6 @@ Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level.
             logger.warning(f"Clause processing failed: {str(e)}")
             return None
 
-    # async def analyze_compliance(
-    #     self,
-    #     clause: Dict[str, str],
-    #     regulations: List[RegulationType]
-    # ) -> Dict[str, Any]:
-    #     """Analyze clause compliance against multiple regulations."""
-    #     try:
-    #         results = {}
-    #         for regulation in regulations:
-    #             try:
-    #                 logger.debug(f"Analyzing {regulation.value} compliance")
-    #                 results[regulation.value] = await self._analyze_single_regulation(
-    #                     clause["text"],
-    #                     regulation
-    #                 )
-    #             except Exception as e:
-    #                 logger.error(f"Failed to analyze {regulation.value}: {str(e)}")
-    #                 results[regulation.value] = self._get_default_result()
-
-    #         return results
-
-    #     except Exception as e:
-    #         logger.error(f"Compliance analysis failed: {str(e)}")
-    #         return {reg.value: self._get_default_result() for reg in regulations}
-
-    # async def _analyze_single_regulation(
-    #     self,
-    #     clause_text: str,
-    #     regulation: RegulationType
-    # ) -> Dict[str, Any]:
-    #     """Analyze compliance against a single regulation."""
-    #     try:
-    #         prompt = self.compliance_prompt.format(
-    #             regulation=regulation.value,
-    #             clause=clause_text
-    #         )
-    #         print(prompt, "COMPLIANCE PROMPT")
-            
-    #         response = await self.llm.generate(prompt)
-    #         cleaned_response = self._extract_json_from_response(response)
-            
-    #         if not cleaned_response:
-    #             raise ValueError("No valid JSON found in response")
-
-    #         result = json.loads(cleaned_response)
-            
-    #         return {
-    #             "compliant": bool(result.get("compliant", False)),
-    #             "requirements_met": result.get("requirements_met", []),
-    #             "requirements_missing": result.get("requirements_missing", []),
-    #             "risk_level": self._validate_risk_level(result.get("risk_level", "high")),
-    #             "findings": result.get("findings", []),
-    #             "recommendations": result.get("recommendations", [])
-    #         }
-
-    #     except Exception as e:
-    #         logger.error(f"Regulation analysis failed for {regulation.value}: {str(e)}")
-    #         return self._get_default_result()
-
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         if not text or not isinstance(text, str):
@@ -411,9 +763,8 @@ Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level.
             return "other"
         
         category = self._clean_text(str(category)).lower().replace(" ", "_")
-        valid_categories = {item.value for item in ClauseCategory}
         
-        return category if category in valid_categories else "other"
+        return category if category in CATEGORY_VALUES else "other"
 
     def _process_list(self, items: list, processor_func) -> List[str]:
         """Process list items with given function."""
@@ -437,9 +788,8 @@ Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level.
             return "high"
         
         risk_level = risk_level.lower().strip()
-        valid_levels = ["high", "medium", "low"]
         
-        return risk_level if risk_level in valid_levels else "high"
+        return risk_level if risk_level in RISK_LEVEL_VALUES else "high"
 
     def _get_default_result(self) -> Dict[str, Any]:
         """Get default result for error cases."""
@@ -462,37 +812,48 @@ Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level.
             # Clean response first
             response = self._clean_response(response)
             
-            # Method 1: Find complete JSON object
-            json_match = re.search(r'\{[\s\S]*\}', response)
+            # Method 1: Scan for the first balanced JSON object that parses
+            for start, end in _iter_json_spans(response):
+                if response[start] != '{':
+                    continue
+                potential_json = response[start:end]
+                try:
+                    orjson.loads(potential_json)
+                    return potential_json
+                except orjson.JSONDecodeError:
+                    continue
+
+            # Method 2: Find complete JSON object
+            json_match = _JSON_OBJ_RE.search(response)
             if json_match:
                 try:
                     potential_json = json_match.group(0)
                     # Verify it can be parsed
-                    json.loads(potential_json)
+                    orjson.loads(potential_json)
                     return potential_json
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     pass
 
-            # Method 2: Find JSON array
-            array_match = re.search(r'\[[\s\S]*\]', response)
+            # Method 3: Find JSON array
+            array_match = _JSON_ARR_RE.search(response)
             if array_match:
                 try:
                     potential_json = array_match.group(0)
                     # Verify it can be parsed
-                    json.loads(potential_json)
+                    orjson.loads(potential_json)
                     return potential_json
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     pass
 
-            # Method 3: Try to extract individual JSON objects
-            objects = re.findall(r'\{[^{}]*\}', response)
+            # Method 4: Try to extract individual JSON objects
+            objects = _JSON_SMALL_OBJ_RE.findall(response)
             if objects:
                 # For single object, return first valid JSON
                 for obj in objects:
                     try:
-                        json.loads(obj)
+                        orjson.loads(obj)
                         return obj
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         continue
 
             return None
@@ -505,19 +866,9 @@ Return ONLY the JSON object. Use only "high", "medium", or "low" for risk_level.
         """Clean and normalize LLM response."""
         if not response:
             return ""
-            
-        # Remove non-printable characters except newlines and spaces
-        response = ''.join(char for char in response if char.isprintable() or char in ['\n', ' '])
-        
-        # Normalize quotes
-        response = response.replace('"', '"').replace('"', '"')
-        
-        # Remove any markdown code block indicators
-        response = re.sub(r'```json\s*', '', response)
-        response = re.sub(r'```\s*', '', response)
-        
-        # Remove any leading/trailing whitespace
-        response = response.strip()
-        
-        return response
+        return self._normalize_response(response)
+
+    def _normalize_response(self, response: str) -> str:
+        """Strip control characters and markdown fences."""
+        return _MD_FENCE_RE.sub('', response.translate(_CLEAN_TABLE)).strip()
 
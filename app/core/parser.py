@@ -4,18 +4,23 @@ import PyPDF2
 from app.utils import FileParsingError, logger
 import re
 
+# Drops control characters (other than whitespace, which _WS_RE collapses)
+# and straightens typographic double quotes in a single translate pass
+_TXT_TABLE = str.maketrans({
+    **{chr(i): None for i in range(32) if not chr(i).isspace()},
+    '\u201c': '"',
+    '\u201d': '"'
+})
+_WS_RE = re.compile(r'\s+')
+
 class ContractParser:
     @staticmethod
     def parse(file_path: str) -> str:
         try:
             file_path = Path(file_path)
             
-            if file_path.suffix.lower() == '.pdf':
-                return ContractParser._parse_pdf(file_path)
-            elif file_path.suffix.lower() in ['.docx', '.doc']:
-                return ContractParser._parse_word(file_path)
-            else:
-                return ContractParser._parse_text(file_path)
+            handler = _HANDLERS.get(file_path.suffix.lower(), ContractParser._parse_text)
+            return handler(file_path)
         except Exception as e:
             logger.error(f"Error parsing file {file_path}: {str(e)}")
             raise FileParsingError(f"Failed to parse file: {str(e)}")
@@ -25,11 +30,9 @@ class ContractParser:
         try:
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+                # Collect page texts and join once instead of repeated concatenation
+                parts = [page.extract_text() for page in pdf_reader.pages]
+                text = "\n".join(part for part in parts if part)
                 
                 # Clean the extracted text
                 text = ContractParser._clean_text(text)
@@ -45,7 +48,10 @@ class ContractParser:
     def _parse_word(file_path: Path) -> str:
         try:
             doc = docx.Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()])
+            # Read each paragraph's text once; python-docx rebuilds it from XML per access
+            text = "\n".join(
+                text for text in (paragraph.text for paragraph in doc.paragraphs) if text.strip()
+            )
             
             # Clean the extracted text
             text = ContractParser._clean_text(text)
@@ -76,12 +82,12 @@ class ContractParser:
     @staticmethod
     def _clean_text(text: str) -> str:
         """Clean and normalize extracted text."""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove special characters that might interfere with JSON
-        text = text.replace('\u0000', '')
-        # Normalize quotes
-        text = text.replace('"', '"').replace('"', '"')
-        # Remove other problematic characters
-        text = ''.join(char for char in text if ord(char) >= 32)
-        return text.strip()
\ No newline at end of file
+        # Remove problematic characters, normalize quotes and collapse whitespace
+        return _WS_RE.sub(' ', text.translate(_TXT_TABLE)).strip()
+
+# Parser for each supported file suffix; anything else is read as plain text
+_HANDLERS = {
+    '.pdf': ContractParser._parse_pdf,
+    '.docx': ContractParser._parse_word,
+    '.doc': ContractParser._parse_word
+}
\ No newline at end of file
@@ -1,10 +1,35 @@
 # app/core/report.py
-from typing import Dict, List
+from typing import Dict, Hashable, Iterable, List
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import chain
 from app.services.llm import LLMService
 from app.models.enums import RegulationType
 from app.utils import ReportGenerationError, logger
 
+@dataclass
+class _ComplianceAggregate:
+    """Counters collected in a single pass over compliance results."""
+    total: int = 0
+    compliant: int = 0
+    risk_counts: Counter = field(default_factory=Counter)
+    # Per-result lists from high-risk items, de-duplicated lazily at the end
+    critical_findings: List[List[str]] = field(default_factory=list)
+    actions: List[List[str]] = field(default_factory=list)
+
+def _top_k_distinct(items: Iterable[Hashable], k: int) -> List:
+    """First k distinct items in order, stopping as soon as k are found."""
+    seen = set()
+    out = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            out.append(item)
+            if len(out) == k:
+                break
+    return out
+
 class ReportGenerator:
     def __init__(self, llm_service: LLMService):
         self.llm = llm_service
@@ -38,16 +63,25 @@ class ReportGenerator:
     ) -> Dict:
         """Generate comprehensive summary of findings."""
         try:
+            aggregate = self._aggregate(compliance_results)
+
             # Initialize summary
             summary = {
                 "total_clauses": len(clauses),
                 "analyzed_regulations": [reg.value for reg in regulations],
                 "timestamp": datetime.now().isoformat(),
-                "overall_compliance": self._calculate_overall_compliance(compliance_results),
-                "risk_distribution": self._calculate_risk_distribution(compliance_results),
+                "overall_compliance": {
+                    "compliant_clauses": aggregate.compliant,
+                    "non_compliant_clauses": aggregate.total - aggregate.compliant,
+                    "compliance_percentage": round(
+                        (aggregate.compliant / aggregate.total * 100) if aggregate.total > 0 else 0, 2
+                    )
+                },
+                "risk_distribution": {"high": 0, "medium": 0, "low": 0, **aggregate.risk_counts},
                 "category_analysis": self._analyze_categories(clauses),
-                "critical_findings": self._extract_critical_findings(compliance_results),
-                "key_actions_required": self._extract_key_actions(compliance_results)
+                # Limit to the first few distinct high-risk items
+                "critical_findings": _top_k_distinct(chain.from_iterable(aggregate.critical_findings), 5),
+                "key_actions_required": _top_k_distinct(chain.from_iterable(aggregate.actions), 5)
             }
             return summary
 
@@ -60,70 +94,30 @@ class ReportGenerator:
                 "error": str(e)
             }
 
-    def _calculate_overall_compliance(self, compliance_results: Dict) -> Dict:
-        """Calculate overall compliance metrics."""
-        total = 0
-        compliant = 0
-        
+    def _aggregate(self, compliance_results: Dict) -> _ComplianceAggregate:
+        """Collect compliance, risk and high-risk finding totals in one pass."""
+        aggregate = _ComplianceAggregate()
+
         for clause_results in compliance_results.values():
             for reg_result in clause_results.values():
-                total += 1
+                aggregate.total += 1
                 if reg_result.get("compliant", False):
-                    compliant += 1
-        
-        return {
-            "compliant_clauses": compliant,
-            "non_compliant_clauses": total - compliant,
-            "compliance_percentage": round((compliant / total * 100) if total > 0 else 0, 2)
-        }
+                    aggregate.compliant += 1
 
-    def _calculate_risk_distribution(self, compliance_results: Dict) -> Dict:
-        """Calculate risk level distribution."""
-        risk_counts = {
-            "high": 0,
-            "medium": 0,
-            "low": 0
-        }
-        
-        for clause_results in compliance_results.values():
-            for reg_result in clause_results.values():
                 risk_level = reg_result.get("risk_level", "high").lower()
-                risk_counts[risk_level] = risk_counts.get(risk_level, 0) + 1
-        
-        return risk_counts
+                aggregate.risk_counts[risk_level] += 1
+
+                if risk_level == "high":
+                    aggregate.critical_findings.append(reg_result.get("findings", []))
+                    aggregate.actions.append(reg_result.get("recommendations", []))
+
+        return aggregate
 
     def _analyze_categories(self, clauses: List[Dict]) -> Dict:
         """Analyze clause categories."""
-        categories = {}
-        for clause in clauses:
-            category = clause.get("primary_category", "other")
-            categories[category] = categories.get(category, 0) + 1
+        categories = Counter(clause.get("primary_category", "other") for clause in clauses)
         
         return {
-            "distribution": categories,
-            "primary_concerns": sorted(categories.items(), key=lambda x: x[1], reverse=True)[:3]
-        }
-
-    def _extract_critical_findings(self, compliance_results: Dict) -> List[str]:
-        """Extract critical findings from high-risk items."""
-        critical_findings = []
-        for clause_results in compliance_results.values():
-            for reg_result in clause_results.values():
-                if reg_result.get("risk_level") == "high":
-                    findings = reg_result.get("findings", [])
-                    critical_findings.extend(findings)
-        
-        # Remove duplicates and limit to most critical
-        return list(set(critical_findings))[:5]
-
-    def _extract_key_actions(self, compliance_results: Dict) -> List[str]:
-        """Extract key recommended actions."""
-        actions = []
-        for clause_results in compliance_results.values():
-            for reg_result in clause_results.values():
-                if reg_result.get("risk_level") == "high":
-                    recommendations = reg_result.get("recommendations", [])
-                    actions.extend(recommendations)
-        
-        # Remove duplicates and limit to most important
-        return list(set(actions))[:5]
\ No newline at end of file
+            "distribution": dict(categories),
+            "primary_concerns": categories.most_common(3)
+        }
\ No newline at end of file
@@ -1,14 +1,33 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes.contracts import router as contracts_router
 from app.config import get_settings
+from app.services.llm import get_cached_llm_service
+from app.utils import setup_logging
+from app.core.analyzer import ContractAnalyzer
 
 settings = get_settings()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging(settings.LOG_LEVEL)
+    # Share a single LLM client (and its connection pool) across all requests
+    app.state.llm = get_cached_llm_service(settings.GROQ_API_KEY)
+    # The analyzer and its collaborators hold no per-request state
+    app.state.analyzer = ContractAnalyzer(app.state.llm)
+    yield
+    await app.state.llm.aclose()
+    # The closed client can't be reused by a later startup
+    get_cached_llm_service.cache_clear()
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="API for analyzing contract compliance across multiple regulations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -1,4 +1,11 @@
-from .enums import RegulationType, ClauseCategory, RiskLevel
+from .enums import (
+    RegulationType,
+    ClauseCategory,
+    RiskLevel,
+    REGULATION_VALUES,
+    CATEGORY_VALUES,
+    RISK_LEVEL_VALUES
+)
 from .schemas import (
     ContractAnalysisRequest,
     ClauseAnalysis,
@@ -23,4 +23,9 @@ class ClauseCategory(str, Enum):
 class RiskLevel(str, Enum):
     HIGH = "high"
     MEDIUM = "medium"
-    LOW = "low"
\ No newline at end of file
+    LOW = "low"
+
+# Value sets for O(1) membership checks outside Pydantic validation
+REGULATION_VALUES = frozenset(item.value for item in RegulationType)
+CATEGORY_VALUES = frozenset(item.value for item in ClauseCategory)
+RISK_LEVEL_VALUES = frozenset(item.value for item in RiskLevel)
\ No newline at end of file
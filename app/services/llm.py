@@ -1,56 +1,139 @@
 # app/services/llm.py
-from langchain_groq import ChatGroq
-from langchain.schema import HumanMessage, SystemMessage
 from app.config import get_settings
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Awaitable, Callable, Optional, Dict, Any, List, Tuple, TypeVar
 from app.utils import LLMServiceError, logger
-from tenacity import retry, stop_after_attempt, wait_exponential
-import json
+from collections import OrderedDict
+from functools import lru_cache
+import asyncio
+import hashlib
+import orjson
+import httpx
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+# Retry envelope for generation requests: up to 3 attempts, waiting
+# 2**(attempt-1) seconds between them, clamped to [4, 10] (so 4s, then 4s)
+RETRY_ATTEMPTS = 3
+RETRY_WAIT_MIN = 4
+RETRY_WAIT_MAX = 10
+
+T = TypeVar("T")
+
+async def _with_retry(fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+    """Await fn(*args, **kwargs), retrying failures with exponential backoff.
+
+    The last failure is re-raised once every attempt is used up.
+    """
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception:
+            if attempt == RETRY_ATTEMPTS:
+                raise
+            await asyncio.sleep(min(RETRY_WAIT_MAX, max(RETRY_WAIT_MIN, 2 ** (attempt - 1))))
 
 class LLMService:
+    _BASE_SYSTEM_PROMPT = (
+        "You are a contract analysis assistant. "
+        "Always return responses in valid JSON format. "
+        "Do not include any additional text or explanations."
+    )
+    _BASE_SYSTEM_MSG = {"role": "system", "content": _BASE_SYSTEM_PROMPT}
+
     def __init__(self, api_key: str, model_name: Optional[str] = None):
         self.settings = get_settings()
         self.model_name = model_name or self.settings.MODEL_NAME
-        print(model_name, "MODEL NAME")
+        logger.debug("LLM model=%s", self.model_name)
+        # In-flight generations keyed by (system, user) so identical
+        # concurrent prompts share one upstream request
+        self._inflight: Dict[Tuple[Optional[str], str], asyncio.Future] = {}
+        # System messages built once per distinct system prompt; callers pass
+        # a small, fixed set of prompts
+        self._system_msgs: Dict[str, Dict[str, str]] = {}
+        self._model = "llama-3.1-8b-instant"#self.model_name
+        # Request fields other than the messages never change per call, so
+        # they're built once; JSON mode guarantees a parseable object, but
+        # Groq doesn't support it on streamed responses
+        self._request_fields: Dict[bool, Dict[str, Any]] = {
+            False: {
+                "model": self._model,
+                "temperature": 0,
+                "max_tokens": 4096,
+                "stream": False,
+                "response_format": {"type": "json_object"}
+            },
+            True: {
+                "model": self._model,
+                "temperature": 0,
+                "max_tokens": 4096,
+                "stream": True
+            }
+        }
+        # LRU of completed responses keyed by a digest of (model, system, user);
+        # requests run at temperature 0, so identical prompts are idempotent
+        self._response_cache: "OrderedDict[bytes, str]" = OrderedDict()
         try:
-            self.llm = ChatGroq(
-                api_key=api_key,
-                model_name="llama-3.1-8b-instant",#self.model_name,
-                temperature=0,
-                max_tokens=4096,
-                streaming=False
+            # One pooled HTTP/2 client shared by every call made through this
+            # service, talking to Groq's OpenAI-compatible API directly
+            self._http_client = httpx.AsyncClient(
+                base_url=GROQ_BASE_URL,
+                headers={"Authorization": f"Bearer {api_key}"},
+                http2=True,
+                timeout=60,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
             )
         except Exception as e:
             logger.error(f"Failed to initialize LLM service: {str(e)}")
             raise LLMServiceError(f"LLM service initialization failed: {str(e)}")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
-    async def generate(self, prompt: str) -> str:
-        """Generate response from LLM with retry logic."""
-        if not prompt:
+    async def generate(self, user: str, system: Optional[str] = None) -> str:
+        """Generate response from LLM with retry logic.
+
+        ``system`` holds the static instructions and should be byte-identical
+        across calls so the provider can reuse its cached prefix; ``user``
+        carries the per-call content. Repeated prompts are answered from an
+        LRU cache, and concurrent calls with the same prompt are coalesced
+        into a single request.
+        """
+        if not user:
             raise LLMServiceError("Empty prompt provided")
-        # print(prompt,"PROMPT")
+
+        cache_key = self._cache_key(user, system)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            return cached
+
+        key = (system, user)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(_with_retry(self._generate, user, system))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller being cancelled doesn't cancel the shared request
+        response = await asyncio.shield(task)
+
+        self._response_cache[cache_key] = response
+        self._response_cache.move_to_end(cache_key)
+        while len(self._response_cache) > self.settings.LLM_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+        return response
+
+    async def _generate(self, user: str, system: Optional[str] = None) -> str:
+        """Send one generation request."""
         try:
-            messages = [
-                SystemMessage(content=(
-                    "You are a contract analysis assistant. "
-                    "Always return responses in valid JSON format. "
-                    "Do not include any additional text or explanations."
-                )),
-                HumanMessage(content=prompt)
-            ]
-            # print(messages, "MESSAGE")
-            
-            response = await self.llm.agenerate(messages=[messages])
-            # print(response)
+            response = await self._http_client.post(
+                "/chat/completions",
+                content=self._request_body(user, system),
+                headers={"Content-Type": "application/json"}
+            )
+            response.raise_for_status()
             
-            if not response or not response.generations:
+            choices = orjson.loads(response.content).get("choices")
+            if not choices:
                 raise LLMServiceError("Empty response from LLM")
             
-            generated_text = response.generations[0][0].text.strip()
+            generated_text = (choices[0]["message"].get("content") or "").strip()
             if not generated_text:
                 raise LLMServiceError("Empty text in LLM response")
             
@@ -58,4 +141,73 @@ class LLMService:
             
         except Exception as e:
             logger.error(f"LLM generation failed: {str(e)}")
-            raise LLMServiceError(f"LLM generation failed: {str(e)}")
\ No newline at end of file
+            raise LLMServiceError(f"LLM generation failed: {str(e)}")
+
+    async def generate_stream(self, user: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream response text from the LLM as it is generated.
+
+        Not retried: a failed stream may already have yielded partial output.
+        """
+        if not user:
+            raise LLMServiceError("Empty prompt provided")
+        try:
+            async with self._http_client.stream(
+                "POST",
+                "/chat/completions",
+                content=self._request_body(user, system, stream=True),
+                headers={"Content-Type": "application/json"}
+            ) as response:
+                response.raise_for_status()
+                # Server-sent events: one "data: {...}" line per delta
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = orjson.loads(data).get("choices")
+                    content = choices[0].get("delta", {}).get("content") if choices else None
+                    if content:
+                        yield content
+        except Exception as e:
+            logger.error(f"LLM streaming failed: {str(e)}")
+            raise LLMServiceError(f"LLM streaming failed: {str(e)}")
+
+    def _cache_key(self, user: str, system: Optional[str]) -> bytes:
+        """Digest identifying a prompt for the response cache."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self._model, system or "", user):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.digest()
+
+    def _request_body(self, user: str, system: Optional[str] = None, stream: bool = False) -> bytes:
+        """Serialize a chat completion request for a system/user prompt pair."""
+        return orjson.dumps({
+            **self._request_fields[stream],
+            "messages": self._build_messages(user, system)
+        })
+
+    def _build_messages(self, user: str, system: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a system/user prompt pair."""
+        if not system:
+            system_msg = self._BASE_SYSTEM_MSG
+        else:
+            system_msg = self._system_msgs.get(system)
+            if system_msg is None:
+                system_msg = {"role": "system", "content": f"{self._BASE_SYSTEM_PROMPT}\n\n{system}"}
+                self._system_msgs[system] = system_msg
+        return [system_msg, {"role": "user", "content": user}]
+
+    def evict(self, user: str, system: Optional[str] = None) -> None:
+        """Drop a cached response, e.g. one the caller could not use."""
+        self._response_cache.pop(self._cache_key(user, system), None)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._http_client.aclose()
+
+@lru_cache(maxsize=4)
+def get_cached_llm_service(api_key: str, model_name: Optional[str] = None) -> LLMService:
+    """Return the process-wide LLMService for this key and model, building it once."""
+    return LLMService(api_key, model_name)
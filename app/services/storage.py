@@ -1,17 +1,22 @@
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, List, Optional
 from fastapi import UploadFile
 from app.config import get_settings
-from app.utils import StorageError, logger
+from app.utils import StorageError, ValidationError, logger
+import asyncio
 import tempfile
-import uuid
+import secrets
 import shutil
 import os
 
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+
 class StorageService:
     def __init__(self):
         self.settings = get_settings()
-        self.temp_dir = Path(tempfile.gettempdir()) / "contract_analyzer"
+        # Each service instance (one per request) gets its own subdirectory,
+        # so cleanup never removes files another request is still using
+        self.temp_dir = Path(tempfile.gettempdir()) / "contract_analyzer" / secrets.token_hex(8)
         self._ensure_temp_dir()
 
     def _ensure_temp_dir(self):
@@ -24,18 +29,27 @@ class StorageService:
 
     async def save_temp_file(self, file: UploadFile) -> str:
         """Save uploaded file to temporary storage."""
-        try:
-            # Generate unique filename
-            ext = Path(file.filename).suffix
-            temp_filename = f"{uuid.uuid4()}{ext}"
-            temp_path = self.temp_dir / temp_filename
+        # Only known extensions reach the temp dir; the parser dispatches on them
+        ext = Path(file.filename or "").suffix.lower()
+        if ext not in self.settings.ALLOWED_EXTENSIONS:
+            raise ValidationError(f"Invalid file type: {file.filename}")
 
-            # Save file
-            content = await file.read()
-            with open(temp_path, 'wb') as f:
-                f.write(content)
+        # Generate unique filename
+        temp_path = self.temp_dir / f"{secrets.token_hex(8)}{ext}"
+        try:
+            # Reject oversize uploads before touching disk when the size is known
+            if file.size is not None and file.size > self.settings.MAX_UPLOAD_SIZE:
+                raise self._oversize_error(file)
+            # Copy the spooled upload in a single worker thread rather than one
+            # thread hop per chunk
+            total = await asyncio.to_thread(self._copy_upload, file.file, temp_path)
+            if total > self.settings.MAX_UPLOAD_SIZE:
+                raise self._oversize_error(file)
 
             return str(temp_path)
+        except ValidationError:
+            await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+            raise
         except Exception as e:
             logger.error(f"Failed to save temp file: {str(e)}")
             raise StorageError(f"File save failed: {str(e)}")
@@ -43,18 +57,46 @@ class StorageService:
     async def delete_temp_file(self, file_path: str):
         """Delete temporary file."""
         try:
-            path = Path(file_path)
-            if path.exists() and path.is_file():
-                path.unlink()
+            await asyncio.to_thread(self._unlink_file, Path(file_path))
         except Exception as e:
             logger.error(f"Failed to delete temp file: {str(e)}")
             raise StorageError(f"File deletion failed: {str(e)}")
 
+    async def delete_temp_files(self, file_paths: List[str]):
+        """Delete several temporary files in one pass."""
+        results = await asyncio.gather(
+            *[asyncio.to_thread(os.remove, path) for path in file_paths],
+            return_exceptions=True
+        )
+        for path, result in zip(file_paths, results):
+            if isinstance(result, Exception) and not isinstance(result, FileNotFoundError):
+                logger.error(f"Failed to delete temp file {path}: {str(result)}")
+
     async def cleanup(self):
-        """Cleanup temporary files."""
+        """Remove this service's temporary directory and everything in it."""
         try:
             if self.temp_dir.exists():
-                shutil.rmtree(self.temp_dir)
+                await asyncio.to_thread(shutil.rmtree, self.temp_dir)
         except Exception as e:
             logger.error(f"Failed to cleanup temp directory: {str(e)}")
-            raise StorageError(f"Cleanup failed: {str(e)}")
\ No newline at end of file
+            raise StorageError(f"Cleanup failed: {str(e)}")
+
+    def _oversize_error(self, file: UploadFile) -> ValidationError:
+        """Build the error raised for uploads over MAX_UPLOAD_SIZE."""
+        return ValidationError(
+            f"File {file.filename} exceeds maximum upload size of {self.settings.MAX_UPLOAD_SIZE} bytes"
+        )
+
+    @staticmethod
+    def _copy_upload(src: BinaryIO, dest: Path) -> int:
+        """Copy an upload's file object to dest, returning the bytes written."""
+        src.seek(0)
+        with open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst, UPLOAD_CHUNK_SIZE)
+            return dst.tell()
+
+    @staticmethod
+    def _unlink_file(path: Path) -> None:
+        """Remove path if it is an existing regular file."""
+        if path.exists() and path.is_file():
+            path.unlink()
\ No newline at end of file
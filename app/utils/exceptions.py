@@ -0,0 +1,32 @@
+# app/utils/exceptions.py
+class ContractAnalyzerError(Exception):
+    """Base exception for Contract Analyzer."""
+    pass
+
+class FileParsingError(ContractAnalyzerError):
+    """Raised when file parsing fails."""
+    pass
+
+class AnalysisError(ContractAnalyzerError):
+    """Raised when contract analysis fails."""
+    pass
+
+class ComplianceError(ContractAnalyzerError):
+    """Raised when compliance analysis fails."""
+    pass
+
+class ReportGenerationError(ContractAnalyzerError):
+    """Raised when report generation fails."""
+    pass
+
+class LLMServiceError(ContractAnalyzerError):
+    """Raised when LLM service encounters an error."""
+    pass
+
+class StorageError(ContractAnalyzerError):
+    """Raised when storage operations fail."""
+    pass
+
+class ValidationError(ContractAnalyzerError):
+    """Raised when validation fails."""
+    pass